@@ -2,6 +2,7 @@
 
 import csv
 import json
+import textwrap
 
 def save_as_csv(path, data, headers):
     with open(path, "w", newline="", encoding="utf-8") as f:
@@ -29,5 +30,12 @@ def save_as_html(path, data, headers):
         f.write("</table></body></html>")
 
 def save_as_json(path, data):
+    # Rows are written one at a time so that sorted output can be streamed from
+    # disk; the result matches json.dump(data, f, indent=4) byte for byte.
     with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
\ No newline at end of file
+        first = True
+        for row in data:
+            f.write("[\n" if first else ",\n")
+            first = False
+            f.write(textwrap.indent(json.dumps(row, indent=4, ensure_ascii=False), "    "))
+        f.write("[]" if first else "\n]")
\ No newline at end of file
@@ -1,15 +1,25 @@
 # main.py
 
+import time
+_startup_begin = time.perf_counter()  # Taken before the Qt imports so they count towards startup time
+
 import sys
 import os  # For path operations
+from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtGui import QFontDatabase, QFont
 
 from ui_settings_window import SettingsWindow
-from styles import PREDEFINED_THEMES, get_base_theme
+from styles import PREDEFINED_THEMES, get_theme_stylesheet
+from startup_timing import StartupTimer
+
 
 if __name__ == "__main__":
+    timer = StartupTimer(start=_startup_begin)
+    timer.mark("imports")
+
     app = QApplication(sys.argv)
+    timer.mark("QApplication")
 
     # Robust font handling
     font_families = QFontDatabase.families()
@@ -27,15 +37,17 @@ if __name__ == "__main__":
             print(f"Warning: JetBrains Mono and fallbacks not found. Using system default: {preferred_font}.")
 
     app.setFont(QFont(preferred_font, 10))
+    timer.mark("font resolution")
 
     # Apply the default theme on startup
     default_theme_name = "Dark Blue (Default)"
     if default_theme_name in PREDEFINED_THEMES:
         colors = PREDEFINED_THEMES[default_theme_name]
-        stylesheet = get_base_theme(**colors)
+        stylesheet = get_theme_stylesheet(colors)
         app.setStyleSheet(stylesheet)
     else:
         print(f"Warning: Default theme '{default_theme_name}' not found in presets.")
+    timer.mark("theme")
 
     # Get the absolute path to this main.py script for the registry handler
     # This ensures the context menu correctly calls this script.
@@ -43,4 +55,12 @@ if __name__ == "__main__":
 
     window = SettingsWindow(main_script_path=main_script_path)
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    timer.mark("window shown")
+
+    def on_event_loop_started():
+        timer.mark("first event loop pass")
+        timer.report()
+
+    # Runs once the event loop has processed the initial show/paint events
+    QTimer.singleShot(0, on_event_loop_started)
+    sys.exit(app.exec())
@@ -0,0 +1,450 @@
+# network_scan.py
+
+import asyncio
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_INITIAL_CONCURRENCY = 8
+DEFAULT_MAX_CONCURRENCY = 64
+# Transient failures (timeouts, dropped connections) are retried this many times
+MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 0.05
+
+# Errors that describe the entry rather than the health of the server
+EXPECTED_ERRORS = (FileNotFoundError, PermissionError, NotADirectoryError)
+
+
+class LocalFS:
+    """Filesystem access used by the network scanner. Every call is one round trip."""
+
+    def scandir(self, path):
+        """Returns (name, is_dir, is_symlink) for each entry, like os.walk sees them."""
+        entries = []
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                try:
+                    is_symlink = entry.is_symlink()
+                except OSError:
+                    is_symlink = False
+                entries.append((entry.name, is_dir, is_symlink))
+        return entries
+
+    def stat(self, path):
+        return os.stat(path)
+
+
+class LatencyInjectingFS(LocalFS):
+    """Local filesystem stand-in that behaves like a slow network share.
+
+    Each call sleeps for `latency` seconds (plus random jitter) before hitting the
+    real disk. When more than `server_capacity` calls are in flight the latency
+    grows proportionally, and `error_rate` makes a fraction of calls fail with a
+    TimeoutError, so the adaptive concurrency can be exercised on any machine.
+    """
+
+    def __init__(self, latency=0.02, jitter=0.0, server_capacity=None, error_rate=0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.server_capacity = server_capacity
+        self.error_rate = error_rate
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def _round_trip(self):
+        with self._lock:
+            self._in_flight += 1
+            in_flight = self._in_flight
+        try:
+            delay = self.latency + random.uniform(0, self.jitter)
+            if self.server_capacity and in_flight > self.server_capacity:
+                delay *= in_flight / self.server_capacity
+            time.sleep(delay)
+            if self.error_rate and random.random() < self.error_rate:
+                raise TimeoutError("Injected network timeout")
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def scandir(self, path):
+        self._round_trip()
+        return super().scandir(path)
+
+    def stat(self, path):
+        self._round_trip()
+        return super().stat(path)
+
+
+class AdaptiveConcurrencyLimiter:
+    """Gates in-flight calls and tunes the limit from observed latency and errors.
+
+    Latency is tracked per kind of call (directory listings and stats cost
+    different amounts). After every window of completed calls of one kind (one
+    window is `limit` calls), the limit is halved if too many calls failed and cut
+    by a quarter if the mean latency rose well above that kind's baseline. It is
+    only raised while latency stays close to the baseline; in between it is trimmed
+    by one, since rising latency means calls are already queueing on the server.
+
+    The baseline is the lowest window mean seen since the last probe. Every
+    `probe_interval` windows the limit drops to a quarter for one window, and that
+    window's mean becomes the new baseline before the old limit is restored. A
+    quarter of the limit is below the point where calls queue on the server, so
+    the probe measures what the share costs now. If the share becomes uniformly
+    slower, the limit recovers at the next probe instead of staying at the minimum.
+    """
+
+    def __init__(self, initial=DEFAULT_INITIAL_CONCURRENCY, minimum=1, maximum=DEFAULT_MAX_CONCURRENCY,
+                 growth_tolerance=1.25, latency_tolerance=1.5, error_threshold=0.05, probe_interval=20):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = max(minimum, min(initial, maximum))
+        self.growth_tolerance = growth_tolerance
+        self.latency_tolerance = latency_tolerance
+        self.error_threshold = error_threshold
+        self.probe_interval = probe_interval
+        self.baseline_latency = {}
+        self.probes = 0
+        self._windows_since_probe = 0
+        self._limit_before_probe = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.adjustments = 0
+        self._window_latencies = defaultdict(list)
+        self._window_errors = defaultdict(int)
+        self._condition = None
+
+    def bind_to_running_loop(self):
+        """Creates the condition for the current event loop; the limit itself carries over."""
+        self._condition = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    async def release(self, kind, latency, failed):
+        async with self._condition:
+            self.in_flight -= 1
+            self._record(kind, latency, failed)
+            self._condition.notify_all()
+
+    def _record(self, kind, latency, failed):
+        window = self._window_latencies[kind]
+        window.append(latency)
+        if failed:
+            self._window_errors[kind] += 1
+        if len(window) < self.limit:
+            return
+
+        mean_latency = sum(window) / len(window)
+        error_rate = self._window_errors[kind] / len(window)
+        del self._window_latencies[kind]
+        del self._window_errors[kind]
+
+        if self._limit_before_probe is not None:
+            self._finish_probe(kind, mean_latency)
+            return
+
+        baseline = self.baseline_latency.get(kind)
+        if baseline is None or mean_latency < baseline:
+            baseline = self.baseline_latency[kind] = mean_latency
+
+        previous_limit = self.limit
+        if error_rate > self.error_threshold:
+            self.limit = max(self.minimum, self.limit // 2)
+        elif mean_latency > baseline * self.latency_tolerance:
+            self.limit = max(self.minimum, int(self.limit * 0.75))
+        elif mean_latency > baseline * self.growth_tolerance:
+            self.limit = max(self.minimum, self.limit - 1)
+        else:
+            self.limit = min(self.maximum, self.limit + max(1, self.limit // 4))
+        if self.limit != previous_limit:
+            self.adjustments += 1
+
+        self._windows_since_probe += 1
+        if self._windows_since_probe >= self.probe_interval:
+            self._start_probe()
+
+    def _start_probe(self):
+        self.probes += 1
+        self._windows_since_probe = 0
+        self._limit_before_probe = self.limit
+        self.limit = max(self.minimum, self.limit // 4)
+        # Calls already in flight were made at the old limit; start the probe window clean
+        self._window_latencies.clear()
+        self._window_errors.clear()
+
+    def _finish_probe(self, kind, mean_latency):
+        self.limit = self._limit_before_probe
+        self._limit_before_probe = None
+        # Other call kinds re-learn their baseline from their next window
+        self.baseline_latency = {kind: mean_latency}
+
+
+class NetworkScanner:
+    """Scans a directory tree with many listings and stat calls in flight at once.
+
+    An asyncio front end schedules the calls onto a thread pool, gated by an
+    AdaptiveConcurrencyLimiter. Like the serial scan in Worker it makes two passes:
+    count_items() lists every directory to size the progress bar, then scan()
+    lists them again in os.walk order and stats each item. Neither pass holds the
+    whole tree: memory grows with the number of directories still waiting to be
+    listed, plus a window of `order_window` items that are in flight or waiting
+    for an earlier item to finish.
+    """
+
+    def __init__(self, directory, limit_depth_enabled=False, max_depth=0, fs=None,
+                 initial_concurrency=DEFAULT_INITIAL_CONCURRENCY, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 should_continue=None, order_window=None):
+        self.directory = directory
+        self.limit_depth_enabled = limit_depth_enabled
+        self.max_depth = max_depth
+        self.fs = fs or LocalFS()
+        self.max_concurrency = max_concurrency
+        self.order_window = order_window or max_concurrency * 16
+        self.limiter = AdaptiveConcurrencyLimiter(initial=initial_concurrency, maximum=max_concurrency)
+        self.should_continue = should_continue or (lambda: True)
+        self.round_trips = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_latency = 0.0
+        self.elapsed = 0.0
+        self._executor = None
+
+    async def _call(self, kind, func, *args):
+        """Runs one filesystem call in the pool and feeds its latency to the limiter.
+
+        Failures that say something about the entry (missing, no permission) are
+        raised straight away. Anything else is treated as transient and retried up
+        to MAX_RETRIES times with exponential backoff; each retry goes back through
+        the limiter, which has counted the failure and can lower the limit first.
+        """
+        loop = asyncio.get_running_loop()
+
+        def timed_call():
+            start = time.perf_counter()
+            try:
+                return func(*args), None, time.perf_counter() - start
+            except Exception as e:
+                return None, e, time.perf_counter() - start
+
+        for attempt in range(MAX_RETRIES + 1):
+            if attempt:
+                self.retries += 1
+                await asyncio.sleep(RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+            await self.limiter.acquire()
+            result, error, latency = await loop.run_in_executor(self._executor, timed_call)
+            failed = error is not None and not isinstance(error, EXPECTED_ERRORS)
+            self.round_trips += 1
+            self.total_latency += latency
+            if failed:
+                self.errors += 1
+            await self.limiter.release(kind, latency, failed)
+            if not failed:
+                break
+        if error is not None:
+            raise error
+        return result
+
+    def _run(self, coroutine):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                thread_name_prefix="network_scan") as self._executor:
+            try:
+                return asyncio.run(self._bound(coroutine))
+            finally:
+                self.elapsed += time.perf_counter() - start
+                self._executor = None
+
+    async def _bound(self, coroutine):
+        self.limiter.bind_to_running_loop()
+        return await coroutine
+
+    async def _list(self, root, depth):
+        """Lists one directory; returns (dirs, files, walk_into) or None if it can't be read."""
+        try:
+            entries = await self._call("scandir", self.fs.scandir, root)
+        except OSError as err:
+            print(f"Access error: {err}")
+            return None
+
+        dirs = [name for name, is_dir, _ in entries if is_dir]
+        files = [name for name, is_dir, _ in entries if not is_dir]
+        # --- DEPTH LIMIT LOGIC (same rule as the serial scan) ---
+        if self.limit_depth_enabled and depth >= self.max_depth:
+            dirs = []
+        # Like os.walk, symlinked directories are listed but not descended into
+        symlinks = {name for name, is_dir, is_symlink in entries if is_dir and is_symlink}
+        walk_into = [name for name in dirs if name not in symlinks]
+        return dirs, files, walk_into
+
+    def count_items(self):
+        """First pass: counts the items scan() will produce, listing directories concurrently."""
+        return self._run(self._count_items())
+
+    async def _count_items(self):
+        total = 0
+        queue = asyncio.Queue()
+        queue.put_nowait((self.directory, 0))
+
+        async def count_loop():
+            nonlocal total
+            while True:
+                root, depth = await queue.get()
+                try:
+                    listing = await self._list(root, depth) if self.should_continue() else None
+                    if listing:
+                        dirs, files, walk_into = listing
+                        total += len(dirs) + len(files)
+                        for name in walk_into:
+                            queue.put_nowait((os.path.join(root, name), depth + 1))
+                finally:
+                    queue.task_done()
+
+        loops = [asyncio.create_task(count_loop()) for _ in range(self.max_concurrency)]
+        try:
+            await queue.join()
+        finally:
+            for loop_task in loops:
+                loop_task.cancel()
+            await asyncio.gather(*loops, return_exceptions=True)
+        return total
+
+    def scan(self, on_result):
+        """Second pass: lists the tree in os.walk order and stats every item concurrently.
+
+        on_result(index, path, is_dir, stat, error) is called as each stat completes.
+        Indexes follow os.walk order but results arrive out of order, at most
+        `order_window` indexes ahead of the earliest unfinished item. Exactly one of
+        stat and error is None.
+        """
+        self._run(self._scan(on_result))
+
+    async def _scan(self, on_result):
+        queue = asyncio.Queue(maxsize=self.max_concurrency)
+        window = asyncio.Condition()
+        finished = set()
+        earliest_unfinished = 0
+
+        async def mark_finished(index):
+            nonlocal earliest_unfinished
+            async with window:
+                finished.add(index)
+                while earliest_unfinished in finished:
+                    finished.remove(earliest_unfinished)
+                    earliest_unfinished += 1
+                window.notify_all()
+
+        async def stat_loop():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                index, path, is_dir = item
+                # After a cancel the queue is drained without touching the share
+                if self.should_continue():
+                    try:
+                        stat = await self._call("stat", self.fs.stat, path)
+                    except OSError as e:
+                        on_result(index, path, is_dir, None, e)
+                    else:
+                        on_result(index, path, is_dir, stat, None)
+                await mark_finished(index)
+
+        async def walk():
+            # Depth-first stack in os.walk order; the next directories due to be
+            # popped (the top of the stack) have their listings already in flight
+            stack = [(self.directory, 0, None)]
+            index = 0
+            try:
+                while stack and self.should_continue():
+                    for position in range(max(0, len(stack) - self.max_concurrency), len(stack)):
+                        root, depth, listing_task = stack[position]
+                        if listing_task is None:
+                            stack[position] = (root, depth, asyncio.create_task(self._list(root, depth)))
+                    root, depth, listing_task = stack.pop()
+                    listing = await listing_task
+                    if listing is None:
+                        continue
+                    dirs, files, walk_into = listing
+                    for name, is_dir in [(name, True) for name in dirs] + [(name, False) for name in files]:
+                        async with window:
+                            await window.wait_for(lambda: index < earliest_unfinished + self.order_window)
+                        await queue.put((index, os.path.join(root, name), is_dir))
+                        index += 1
+                    stack.extend((os.path.join(root, name), depth + 1, None) for name in reversed(walk_into))
+            finally:
+                pending = [listing_task for _, _, listing_task in stack if listing_task is not None]
+                for listing_task in pending:
+                    listing_task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        # The limiter decides how many of these loops actually have a call in flight
+        loops = [asyncio.create_task(stat_loop()) for _ in range(self.max_concurrency)]
+        try:
+            await walk()
+            for _ in loops:
+                await queue.put(None)
+            await asyncio.gather(*loops)
+        finally:
+            for loop_task in loops:
+                loop_task.cancel()
+
+    def report(self):
+        """Summarizes how much overlapping the round trips saved."""
+        mean_latency = self.total_latency / self.round_trips if self.round_trips else 0.0
+        effective_concurrency = self.total_latency / self.elapsed if self.elapsed else 0.0
+        # Round trips we would have waited on back to back, minus the waits we actually had
+        sequential_waits = self.elapsed / mean_latency if mean_latency else 0.0
+        return {
+            "round_trips": self.round_trips,
+            "errors": self.errors,
+            "retries": self.retries,
+            "elapsed_s": round(self.elapsed, 3),
+            "mean_latency_ms": round(mean_latency * 1000, 2),
+            "effective_concurrency": round(effective_concurrency, 2),
+            "peak_in_flight": self.limiter.peak_in_flight,
+            "final_concurrency_limit": self.limiter.limit,
+            "limit_adjustments": self.limiter.adjustments,
+            "baseline_probes": self.limiter.probes,
+            "round_trips_saved": max(0, round(self.round_trips - sequential_waits)),
+        }
+
+    def format_report(self):
+        report = self.report()
+        return ("Network scan report:\n" +
+                "\n".join(f"  {name.replace('_', ' ')}: {value}" for name, value in report.items()))
+
+
+if __name__ == "__main__":
+    # Benchmark against a simulated share:  python network_scan.py DIR --latency 0.01
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the network scan over a latency-injecting filesystem.")
+    parser.add_argument("directory")
+    parser.add_argument("--latency", type=float, default=0.01, help="Seconds per simulated round trip")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--server-capacity", type=int, default=None,
+                        help="Calls in flight before the simulated server slows down")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--max-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY)
+    args = parser.parse_args()
+
+    scanner = NetworkScanner(
+        args.directory,
+        fs=LatencyInjectingFS(args.latency, args.jitter, args.server_capacity, args.error_rate),
+        max_concurrency=args.max_concurrency,
+    )
+    expected_items = scanner.count_items()
+    scanned_items = []
+    scanner.scan(lambda index, path, is_dir, stat, error: scanned_items.append(index) if error is None else None)
+    print(f"Scanned {len(scanned_items)} of {expected_items} items.")
+    print(scanner.format_report())
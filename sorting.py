@@ -0,0 +1,170 @@
+# sorting.py
+
+import heapq
+import json
+import os
+import sys
+import tempfile
+
+# Display name shown in the UI -> internal sort key id
+SORT_OPTIONS = {
+    "None (Scan Order)": None,
+    "Path": "path",
+    "Size": "size",
+    "Modification Time": "mtime",
+    "Extension": "extension",
+}
+
+DEFAULT_MEMORY_LIMIT_MB = 256
+# Most runs opened at once by one merge, well under the usual 1024 open file limit
+MAX_MERGE_FAN_IN = 128
+
+
+def make_sort_key(sort_by, path, stat, is_dir=False):
+    """Builds a comparable, JSON-serializable key for a scanned item.
+
+    The key is computed from the path and stat result rather than the output row,
+    so sorting works no matter which metadata columns were selected. The path is
+    always the last element (as components for the path sort), which makes the
+    order deterministic for ties.
+    """
+    if sort_by == "path":
+        # Compare component by component so a directory's contents stay together;
+        # as plain strings "a-b" would sort between "a" and "a/z" since "-" < "/"
+        return (tuple(path.split(os.sep)),)
+    if sort_by == "size":
+        # Directories have no meaningful size; group them ahead of files
+        return (0, 0, path) if is_dir else (1, stat.st_size, path)
+    if sort_by == "mtime":
+        return (stat.st_mtime, path)
+    if sort_by == "extension":
+        extension = "" if is_dir else os.path.splitext(path)[1].lower()
+        return (extension, path)
+    raise ValueError(f"Unknown sort key: {sort_by}")
+
+
+def _as_tuple(value):
+    if isinstance(value, list):
+        return tuple(_as_tuple(part) for part in value)
+    return value
+
+
+def _key_size(key):
+    if isinstance(key, tuple):
+        return sys.getsizeof(key) + sum(_key_size(part) for part in key)
+    return sys.getsizeof(key)
+
+
+def _estimate_size(key, row):
+    """Rough estimate of the memory held by one buffered (key, row) pair."""
+    size = sys.getsizeof(row) + _key_size(key)
+    size += sum(sys.getsizeof(value) for value in row.values())
+    return size
+
+
+class ExternalSorter:
+    """Sorts output rows under a memory cap, spilling sorted runs to disk.
+
+    Rows are buffered in memory until the estimated size exceeds the limit. The
+    buffer is then sorted and written to a temporary run file. Iterating the
+    sorter yields all rows in order, either straight from the in-memory buffer
+    (when nothing was spilled) or through a k-way merge of the run files. When
+    there are more runs than `max_fan_in`, they are first merged in groups into
+    intermediate runs so no merge ever holds too many files open.
+    """
+
+    def __init__(self, descending=False, memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB, max_fan_in=MAX_MERGE_FAN_IN):
+        self.descending = descending
+        self.max_fan_in = max(2, max_fan_in)
+        self.memory_limit = max(1, int(memory_limit_mb)) * 1024 * 1024
+        self._buffer = []
+        self._buffer_size = 0
+        self._run_paths = []
+        self._next_run_id = 0
+        self._temp_dir = None
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def add(self, key, row):
+        self._buffer.append((key, row))
+        self._buffer_size += _estimate_size(key, row)
+        self._count += 1
+        if self._buffer_size >= self.memory_limit:
+            self._spill()
+
+    def _sort_buffer(self):
+        self._buffer.sort(key=lambda item: item[0], reverse=self.descending)
+
+    def _spill(self):
+        if not self._buffer:
+            return
+        self._sort_buffer()
+        self._run_paths.append(self._write_run(self._buffer))
+        self._buffer = []
+        self._buffer_size = 0
+
+    def _write_run(self, items):
+        if self._temp_dir is None:
+            self._temp_dir = tempfile.TemporaryDirectory(prefix="directory_printer_sort_")
+        run_path = os.path.join(self._temp_dir.name, f"run_{self._next_run_id:05d}.jsonl")
+        self._next_run_id += 1
+        with open(run_path, "w", encoding="utf-8") as f:
+            for key, row in items:
+                f.write(json.dumps([key, row]))
+                f.write("\n")
+        return run_path
+
+    def _merge_runs(self, run_paths):
+        runs = [self._read_run(run_path) for run_path in run_paths]
+        return heapq.merge(*runs, key=lambda item: item[0], reverse=self.descending)
+
+    def _reduce_runs(self):
+        """Merges runs in groups of max_fan_in until one final merge can take them all."""
+        while len(self._run_paths) > self.max_fan_in:
+            merged_paths = []
+            for start in range(0, len(self._run_paths), self.max_fan_in):
+                group = self._run_paths[start:start + self.max_fan_in]
+                if len(group) == 1:
+                    merged_paths.extend(group)
+                    continue
+                merged_paths.append(self._write_run(self._merge_runs(group)))
+                for run_path in group:
+                    os.remove(run_path)
+            self._run_paths = merged_paths
+
+    @staticmethod
+    def _read_run(run_path):
+        with open(run_path, "r", encoding="utf-8") as f:
+            for line in f:
+                key, row = json.loads(line)
+                # JSON turns tuples into lists; restore them so keys compare consistently
+                yield _as_tuple(key), row
+
+    def __iter__(self):
+        if not self._run_paths:
+            # Everything fit in memory, no merge needed
+            self._sort_buffer()
+            for _, row in self._buffer:
+                yield row
+            return
+
+        # Flush the remainder so every run is merged from disk the same way
+        self._spill()
+        self._reduce_runs()
+        for _, row in self._merge_runs(self._run_paths):
+            yield row
+
+    @property
+    def spilled_runs(self):
+        return len(self._run_paths)
+
+    def close(self):
+        """Removes any spill files. Safe to call more than once."""
+        self._buffer = []
+        self._buffer_size = 0
+        self._run_paths = []
+        if self._temp_dir is not None:
+            self._temp_dir.cleanup()
+            self._temp_dir = None
@@ -0,0 +1,66 @@
+# startup_timing.py
+
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+STARTUP_LOG_FILE_NAME = "startup_times.jsonl"
+MAX_STARTUP_LOG_ENTRIES = 500
+
+
+def get_log_dir():
+    """Returns the per-user directory that holds the startup time log."""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        return os.path.join(base, "DirectoryPrinter")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "directory_printer")
+
+
+class StartupTimer:
+    """Records elapsed time for each startup phase and reports the totals."""
+
+    def __init__(self, start=None):
+        self.start = start if start is not None else time.perf_counter()
+        self.phases = []
+        self.notes = {}
+
+    def mark(self, phase):
+        self.phases.append((phase, time.perf_counter() - self.start))
+
+    def note(self, name, value):
+        self.notes[name] = value
+
+    def report(self, log_dir=None):
+        """Prints the phase timings and appends them to the startup log."""
+        lines = ["Startup time report:"]
+        previous = 0.0
+        for phase, elapsed in self.phases:
+            lines.append(f"  {phase:<24} +{(elapsed - previous) * 1000:8.1f} ms  ({elapsed * 1000:8.1f} ms total)")
+            previous = elapsed
+        for name, value in self.notes.items():
+            lines.append(f"  {name}: {value}")
+        print("\n".join(lines))
+
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "phases_ms": {phase: round(elapsed * 1000, 2) for phase, elapsed in self.phases},
+            "total_ms": round(previous * 1000, 2),
+            **self.notes,
+        }
+        log_path = os.path.join(log_dir or get_log_dir(), STARTUP_LOG_FILE_NAME)
+        try:
+            os.makedirs(os.path.dirname(log_path), exist_ok=True)
+            try:
+                with open(log_path, "r", encoding="utf-8") as f:
+                    history = f.readlines()[-(MAX_STARTUP_LOG_ENTRIES - 1):]
+            except OSError:
+                history = []
+            history.append(json.dumps(entry) + "\n")
+            with open(log_path, "w", encoding="utf-8") as f:
+                f.writelines(history)
+        except OSError as e:
+            print(f"Warning: could not write startup time log: {e}")
+        return entry
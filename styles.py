@@ -1,5 +1,7 @@
 # styles.py
 
+import json
+
 PREDEFINED_THEMES = {
     "Dark Blue (Default)": {
         "primary_bg": "#2b2b2b", "secondary_bg": "#3c3f41",
@@ -152,5 +154,17 @@ def get_base_theme(primary_bg, secondary_bg, text_color, accent_color, button_bg
         selection-background-color: {accent_color};
     }}
     """
+_session_stylesheets = {}
+
+
+def get_theme_stylesheet(colors):
+    """Memoized get_base_theme(**colors) for repeated theme switches within a session."""
+    key = json.dumps(colors, sort_keys=True)
+    stylesheet = _session_stylesheets.get(key)
+    if stylesheet is None:
+        stylesheet = get_base_theme(**colors)
+        _session_stylesheets[key] = stylesheet
+    return stylesheet
+
 # Helper for QSS, since QColor is a Qt class
 from PyQt6.QtGui import QColor
\ No newline at end of file
@@ -0,0 +1,170 @@
+# test_network_scan.py
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from network_scan import AdaptiveConcurrencyLimiter, LatencyInjectingFS, NetworkScanner
+
+try:
+    from worker import Worker
+except ImportError:  # PyQt6 not installed
+    Worker = None
+
+
+class LatencyShiftingFS(LatencyInjectingFS):
+    """Stand-in for a share that becomes uniformly slower part way through a scan."""
+
+    def __init__(self, latency, shifted_latency, shift_after_calls):
+        super().__init__(latency)
+        self.shifted_latency = shifted_latency
+        self.shift_after_calls = shift_after_calls
+        self.calls = 0
+        self._calls_lock = threading.Lock()
+
+    def _round_trip(self):
+        with self._calls_lock:
+            self.calls += 1
+            if self.calls > self.shift_after_calls:
+                self.latency = self.shifted_latency
+        super()._round_trip()
+
+
+def walk_reference(directory, limit_depth_enabled=False, max_depth=0):
+    """The serial scan's item order and depth rule, as in Worker.run."""
+    items = []
+    for root, dirs, files in os.walk(directory):
+        relative_path = os.path.relpath(root, directory)
+        depth = 0 if relative_path == os.curdir else relative_path.count(os.sep) + 1
+        if limit_depth_enabled and depth >= max_depth:
+            dirs[:] = []
+        items.extend((os.path.join(root, name), True) for name in dirs)
+        items.extend((os.path.join(root, name), False) for name in files)
+    return items
+
+
+def run_scan(scanner):
+    """Returns the expected count and the (path, is_dir) items in index order, failing on any error."""
+    total_items = scanner.count_items()
+    results = {}
+
+    def on_result(index, path, is_dir, stat, error):
+        if error is not None:
+            raise AssertionError(f"{path}: {error}")
+        results[index] = (path, is_dir)
+
+    scanner.scan(on_result)
+    return total_items, [results[index] for index in range(len(results))]
+
+
+class NetworkScanTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.root = tempfile.mkdtemp()
+        cls.tree = os.path.join(cls.root, "tree")
+        for top in range(3):
+            for sub in range(3):
+                directory = os.path.join(cls.tree, f"d{top}", f"s{sub}")
+                os.makedirs(directory)
+                for index in range(4):
+                    open(os.path.join(directory, f"f{index}.txt"), "w").close()
+            open(os.path.join(cls.tree, f"d{top}", "top.txt"), "w").close()
+        os.makedirs(os.path.join(cls.tree, "a-b"))
+        open(os.path.join(cls.tree, "readme.md"), "w").close()
+        os.symlink(os.path.join(cls.tree, "d0"), os.path.join(cls.tree, "link"))
+
+        cls.big_tree = os.path.join(cls.root, "big")
+        for top in range(8):
+            directory = os.path.join(cls.big_tree, f"d{top}")
+            os.makedirs(directory)
+            for index in range(50):
+                open(os.path.join(directory, f"f{index}.txt"), "w").close()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.root)
+
+
+class ScanOrderTests(NetworkScanTestCase):
+    def test_matches_os_walk_order(self):
+        for directory in (self.tree, self.tree + os.sep):
+            for limit_depth_enabled, max_depth in ((False, 0), (True, 1), (True, 2)):
+                with self.subTest(directory=directory, max_depth=max_depth if limit_depth_enabled else None):
+                    expected = walk_reference(directory, limit_depth_enabled, max_depth)
+                    # A small window forces results to be held back and released in order
+                    scanner = NetworkScanner(directory, limit_depth_enabled, max_depth, order_window=4)
+                    total_items, items = run_scan(scanner)
+                    self.assertEqual(items, expected)
+                    self.assertEqual(total_items, len(expected))
+
+    @unittest.skipIf(Worker is None, "PyQt6 is not installed")
+    def test_worker_network_mode_matches_serial_scan(self):
+        columns = ["File Name", "Path", "Size", "Type"]
+        for directory in (self.tree, self.tree + os.sep):
+            for sort_by in (None, "path"):
+                outputs = []
+                for network_mode in (False, True):
+                    worker = Worker(directory, columns, True, 1, sort_by=sort_by, network_mode=network_mode)
+                    worker.error.connect(self.fail)
+                    worker.finished.connect(lambda file_data: outputs.append(list(file_data)))
+                    worker.run()
+                with self.subTest(directory=directory, sort_by=sort_by):
+                    self.assertEqual(outputs[0], outputs[1])
+                    self.assertTrue(outputs[0])
+
+
+class AdaptiveConcurrencyTests(NetworkScanTestCase):
+    def test_backs_off_when_server_saturates(self):
+        server_capacity = 4
+        scanner = NetworkScanner(self.big_tree, fs=LatencyInjectingFS(0.005, server_capacity=server_capacity))
+        total_items, items = run_scan(scanner)
+        report = scanner.report()
+        self.assertEqual(len(items), total_items)
+        # Going past capacity only queues work on the server; keep latency near the unloaded 5 ms
+        self.assertLess(report["mean_latency_ms"], 5 * 1.6)
+        self.assertLess(report["effective_concurrency"], server_capacity * 1.6)
+        self.assertGreater(report["effective_concurrency"], server_capacity * 0.5)
+
+    def test_transient_errors_are_retried(self):
+        scanner = NetworkScanner(self.big_tree, fs=LatencyInjectingFS(0.002, error_rate=0.05))
+        total_items, items = run_scan(scanner)
+        self.assertEqual(items, walk_reference(self.big_tree))
+        self.assertEqual(total_items, len(items))
+        self.assertGreater(scanner.report()["retries"], 0)
+
+    def test_recovers_when_share_gets_uniformly_slower(self):
+        scanner = NetworkScanner(self.big_tree, fs=LatencyShiftingFS(0.002, 0.006, shift_after_calls=100))
+        _, items = run_scan(scanner)
+        report = scanner.report()
+        self.assertEqual(len(items), len(walk_reference(self.big_tree)))
+        # Collapsing to serial would leave the limit at 1 and effective concurrency near 1
+        self.assertGreater(report["final_concurrency_limit"], 8)
+        self.assertGreater(report["effective_concurrency"], 4)
+
+    def test_limiter_baseline_follows_slower_latency(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=16, maximum=64, probe_interval=5)
+
+        def feed_window(latency):
+            for _ in range(limiter.limit):
+                limiter._record("stat", latency, False)
+
+        for _ in range(10):
+            feed_window(0.010)
+        for _ in range(40):
+            feed_window(0.030)
+        self.assertAlmostEqual(limiter.baseline_latency["stat"], 0.030)
+        self.assertGreater(limiter.limit, 16)
+
+    def test_limiter_keeps_baseline_per_call_kind(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=4)
+        for _ in range(4):
+            limiter._record("scandir", 0.002, False)
+        for _ in range(limiter.limit):
+            limiter._record("stat", 0.020, False)
+        self.assertEqual(limiter.baseline_latency, {"scandir": 0.002, "stat": 0.020})
+
+
+if __name__ == "__main__":
+    unittest.main()
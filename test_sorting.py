@@ -0,0 +1,87 @@
+# test_sorting.py
+
+import json
+import os
+import random
+import tempfile
+import unittest
+
+from file_operations import save_as_json
+from sorting import ExternalSorter, make_sort_key
+
+
+class ExternalSorterTests(unittest.TestCase):
+    def make_rows(self, count):
+        rng = random.Random(42)
+        return [((rng.randrange(1000), f"item_{i:05d}"), {"Index": i, "Name": f"item_{i:05d}"}) for i in range(count)]
+
+    def check_sorted(self, descending, max_fan_in):
+        rows = self.make_rows(20000)
+        sorter = ExternalSorter(descending, memory_limit_mb=1, max_fan_in=max_fan_in)
+        try:
+            for key, row in rows:
+                sorter.add(key, row)
+            spilled_runs = sorter.spilled_runs
+            result = list(sorter)
+            temp_dir = sorter._temp_dir.name
+            remaining_runs = len(os.listdir(temp_dir))
+        finally:
+            sorter.close()
+
+        expected = [row for _, row in sorted(rows, key=lambda item: item[0], reverse=descending)]
+        self.assertGreater(spilled_runs, max_fan_in)
+        self.assertEqual(result, expected)
+        self.assertLessEqual(remaining_runs, max_fan_in)
+        self.assertFalse(os.path.exists(temp_dir))
+
+    def test_spilled_merge_ascending(self):
+        self.check_sorted(descending=False, max_fan_in=2)
+
+    def test_spilled_merge_descending(self):
+        self.check_sorted(descending=True, max_fan_in=2)
+
+    def test_in_memory_sort(self):
+        rows = self.make_rows(100)
+        sorter = ExternalSorter()
+        for key, row in rows:
+            sorter.add(key, row)
+        self.assertEqual(sorter.spilled_runs, 0)
+        self.assertEqual(list(sorter), [row for _, row in sorted(rows, key=lambda item: item[0])])
+        self.assertEqual(len(sorter), 100)
+
+    def test_path_sort_keeps_directory_contents_together(self):
+        paths = [os.path.join("r", "a-b"), os.path.join("r", "a"), os.path.join("r", "a", "z")]
+        sorter = ExternalSorter(memory_limit_mb=1, max_fan_in=2)
+        try:
+            for path in paths:
+                # Force one run per row so the order also survives the on-disk merge
+                sorter.add(make_sort_key("path", path, None), {"Path": path})
+                sorter._spill()
+            result = [row["Path"] for row in sorter]
+        finally:
+            sorter.close()
+        self.assertEqual(result, [os.path.join("r", "a"), os.path.join("r", "a", "z"), os.path.join("r", "a-b")])
+
+
+class SaveAsJsonTests(unittest.TestCase):
+    def test_matches_json_dumps(self):
+        samples = [
+            [],
+            [{}],
+            [{"File Name": "a.txt", "Size": 12, "Path": "C:\\dir\\a.txt"}],
+            [{"File Name": "näme\n\"quoted\"", "Size": ""}, {"Nested": [1, 2, {"x": None}]}],
+        ]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "out.json")
+            for data in samples:
+                save_as_json(path, data)
+                with open(path, "r", encoding="utf-8") as f:
+                    self.assertEqual(f.read(), json.dumps(data, indent=4, ensure_ascii=False))
+                # Streaming from a generator produces the same output as a list
+                save_as_json(path, (row for row in data))
+                with open(path, "r", encoding="utf-8") as f:
+                    self.assertEqual(f.read(), json.dumps(data, indent=4, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    unittest.main()
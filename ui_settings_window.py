@@ -13,7 +13,8 @@ from PyQt6.QtWidgets import (
 from worker import Worker
 from file_operations import save_as_csv, save_as_html, save_as_json
 import registry_handler
-from styles import PREDEFINED_THEMES, get_base_theme
+from styles import PREDEFINED_THEMES, get_theme_stylesheet
+from sorting import SORT_OPTIONS, DEFAULT_MEMORY_LIMIT_MB
 
 
 class SettingsWindow(QMainWindow):
@@ -60,19 +61,42 @@ class SettingsWindow(QMainWindow):
 
         # --- NEW: Scan Options Group ---
         scan_options_group = QGroupBox("Scan Options")
-        scan_options_layout = QHBoxLayout()
+        scan_options_layout = QVBoxLayout()
+        depth_layout = QHBoxLayout()
         self.depth_limit_check = QCheckBox("Limit scan depth to:")
         self.depth_spinbox = QSpinBox()
         self.depth_spinbox.setRange(1, 100)
         self.depth_spinbox.setValue(3)
         self.depth_spinbox.setEnabled(False)  # Disabled by default
         self.depth_limit_check.toggled.connect(self.depth_spinbox.setEnabled)
-        scan_options_layout.addWidget(self.depth_limit_check)
-        scan_options_layout.addWidget(self.depth_spinbox)
-        scan_options_layout.addStretch()  # Pushes widgets to the left
+        depth_layout.addWidget(self.depth_limit_check)
+        depth_layout.addWidget(self.depth_spinbox)
+        depth_layout.addStretch()  # Pushes widgets to the left
+        scan_options_layout.addLayout(depth_layout)
+        self.network_mode_check = QCheckBox("Network share mode (many concurrent requests, for SMB/NFS)")
+        scan_options_layout.addWidget(self.network_mode_check)
         scan_options_group.setLayout(scan_options_layout)
         layout.addWidget(scan_options_group)
 
+        # --- Output Order Group ---
+        sort_group = QGroupBox("Output Order")
+        sort_layout = QFormLayout()
+        self.sort_combo = QComboBox()
+        self.sort_combo.addItems(SORT_OPTIONS.keys())
+        self.sort_descending_check = QCheckBox("Descending")
+        self.sort_memory_spinbox = QSpinBox()
+        self.sort_memory_spinbox.setRange(16, 16384)
+        self.sort_memory_spinbox.setSuffix(" MB")
+        self.sort_memory_spinbox.setValue(DEFAULT_MEMORY_LIMIT_MB)
+        self.sort_memory_spinbox.setToolTip("Memory used for sorting before spilling to temporary files")
+        self.sort_combo.currentTextChanged.connect(self.update_sort_controls)
+        sort_layout.addRow("Sort by:", self.sort_combo)
+        sort_layout.addRow(self.sort_descending_check)
+        sort_layout.addRow("Sort memory limit:", self.sort_memory_spinbox)
+        sort_group.setLayout(sort_layout)
+        layout.addWidget(sort_group)
+        self.update_sort_controls(self.sort_combo.currentText())
+
         # --- Output Format Group ---
         output_group = QGroupBox("Output Format")
         output_layout = QVBoxLayout()
@@ -115,9 +139,14 @@ class SettingsWindow(QMainWindow):
     def apply_selected_theme(self, theme_name):
         if theme_name in PREDEFINED_THEMES:
             colors = PREDEFINED_THEMES[theme_name]
-            stylesheet = get_base_theme(**colors)
+            stylesheet = get_theme_stylesheet(colors)
             QApplication.instance().setStyleSheet(stylesheet)
 
+    def update_sort_controls(self, sort_name):
+        sorting_enabled = SORT_OPTIONS.get(sort_name) is not None
+        self.sort_descending_check.setEnabled(sorting_enabled)
+        self.sort_memory_spinbox.setEnabled(sorting_enabled)
+
     def handle_context_menu_toggle(self, state):
         is_checked = (state == Qt.CheckState.Checked.value)
         success, message = (registry_handler.add_context_menu_key(self.main_script_path) if is_checked
@@ -155,7 +184,11 @@ class SettingsWindow(QMainWindow):
             directory=target_directory,
             metadata_cols=self.get_selected_metadata(),
             limit_depth_enabled=limit_depth_enabled,
-            max_depth=max_depth
+            max_depth=max_depth,
+            sort_by=SORT_OPTIONS.get(self.sort_combo.currentText()),
+            sort_descending=self.sort_descending_check.isChecked(),
+            sort_memory_limit_mb=self.sort_memory_spinbox.value(),
+            network_mode=self.network_mode_check.isChecked()
         )
         self.worker.moveToThread(self.thread)
 
@@ -178,6 +211,14 @@ class SettingsWindow(QMainWindow):
             self.progress_bar.setFormat(f"Processing %v of %m items... (%p%)")
 
     def on_processing_finished(self, file_data):
+        try:
+            self.save_output(file_data)
+        finally:
+            # Sorted results may hold spill files on disk
+            if hasattr(file_data, "close"):
+                file_data.close()
+
+    def save_output(self, file_data):
         self.progress_bar.setVisible(False)
         self.save_button.setEnabled(True)
 
@@ -205,7 +246,12 @@ class SettingsWindow(QMainWindow):
                 save_as_html(save_path, file_data, selected_metadata)
             elif output_format == "json":
                 save_as_json(save_path, file_data)
-            QMessageBox.information(self, "Success", f"Directory listing saved successfully to:\n{save_path}")
+            message = f"Directory listing saved successfully to:\n{save_path}"
+            report = self.worker.network_report if self.worker else None
+            if report:
+                message += (f"\n\nNetwork scan: {report['round_trips']} round trips at an effective concurrency of "
+                            f"{report['effective_concurrency']}, about {report['round_trips_saved']} round trips saved.")
+            QMessageBox.information(self, "Success", message)
         except Exception as e:
             self.on_processing_error(str(e))
 
@@ -4,7 +4,7 @@ from PyQt6.QtCore import pyqtSignal
 from PyQt6.QtGui import QColor
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QPushButton, QColorDialog
 
-from styles import get_base_theme
+from styles import get_theme_stylesheet
 
 class ThemeDialog(QDialog):
     """A dialog for letting the user customize the application's theme colors."""
@@ -46,7 +46,7 @@ class ThemeDialog(QDialog):
             self.apply_theme()
 
     def apply_theme(self):
-        stylesheet = get_base_theme(**self.colors)
+        stylesheet = get_theme_stylesheet(self.colors)
         self.theme_changed.emit(stylesheet)
 
     def update_button_styles(self):
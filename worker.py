@@ -5,6 +5,9 @@ import sys
 from datetime import datetime
 from PyQt6.QtCore import QObject, pyqtSignal
 
+from sorting import ExternalSorter, make_sort_key, DEFAULT_MEMORY_LIMIT_MB
+from network_scan import NetworkScanner
+
 IS_WINDOWS = sys.platform == "win32"
 if not IS_WINDOWS:
     try:
@@ -17,10 +20,12 @@ if not IS_WINDOWS:
 class Worker(QObject):
     preparation_finished = pyqtSignal(int)
     progress_updated = pyqtSignal(int)
-    finished = pyqtSignal(list)
+    finished = pyqtSignal(object)  # list of rows, or an ExternalSorter when sorting
     error = pyqtSignal(str)
 
-    def __init__(self, directory, metadata_cols, limit_depth_enabled, max_depth):
+    def __init__(self, directory, metadata_cols, limit_depth_enabled, max_depth,
+                 sort_by=None, sort_descending=False, sort_memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB,
+                 network_mode=False):
         super().__init__()
         self.directory = directory
         self.metadata_cols = metadata_cols
@@ -28,18 +33,25 @@ class Worker(QObject):
         # Store the new depth limit options
         self.limit_depth_enabled = limit_depth_enabled
         self.max_depth = max_depth
+        # Output ordering; sort_by is None to keep os.walk order
+        self.sort_by = sort_by
+        self.sort_descending = sort_descending
+        self.sort_memory_limit_mb = sort_memory_limit_mb
+        # Concurrent scan for high-latency shares; network_report is filled in when it finishes
+        self.network_mode = network_mode
+        self.network_report = None
 
     def run(self):
         try:
-            total_items = 0
-            # Normalize the starting path to correctly calculate depth
-            start_path = self.directory.rstrip(os.sep)
-            start_depth = start_path.count(os.sep)
+            if self.network_mode:
+                self.run_network_scan()
+                return
 
+            total_items = 0
             # First pass to count items, respecting the depth limit
             for root, dirs, files in os.walk(self.directory, onerror=lambda err: print(f"Access error: {err}")):
                 # --- DEPTH LIMIT LOGIC ---
-                current_depth = root.count(os.sep) - start_depth
+                current_depth = self.get_depth(root)
                 if self.limit_depth_enabled and current_depth >= self.max_depth:
                     # Clear the dirs list in-place to stop os.walk from descending further
                     dirs[:] = []
@@ -52,14 +64,14 @@ class Worker(QObject):
                 self.finished.emit([])
                 return
 
-            file_data = []
+            file_data = self.create_file_data()
             processed_items = 0
             # Second pass to process items, also respecting the depth limit
             for root, dirs, files in os.walk(self.directory, onerror=lambda err: print(f"Access error: {err}")):
                 if not self.is_running: break
 
                 # --- DEPTH LIMIT LOGIC (APPLIED AGAIN) ---
-                current_depth = root.count(os.sep) - start_depth
+                current_depth = self.get_depth(root)
                 if self.limit_depth_enabled and current_depth >= self.max_depth:
                     dirs[:] = []
 
@@ -69,8 +81,9 @@ class Worker(QObject):
 
                     path = os.path.join(root, name)
                     try:
-                        metadata = self.get_file_metadata(path, self.metadata_cols, is_dir)
-                        file_data.append(metadata)
+                        stat = os.stat(path)
+                        metadata = self.get_file_metadata(path, self.metadata_cols, is_dir, stat)
+                        self.add_row(file_data, path, stat, is_dir, metadata)
                     except FileNotFoundError:
                         print(f"Skipping missing path or broken link: {path}")
                     except Exception as e:
@@ -81,14 +94,93 @@ class Worker(QObject):
 
             if self.is_running:
                 self.finished.emit(file_data)
+            elif self.sort_by:
+                file_data.close()
 
         except Exception as e:
             import traceback
             error_message = f"A fatal error occurred in the worker thread: {e}\n\nTraceback:\n{traceback.format_exc()}"
             self.error.emit(error_message)
 
-    def get_file_metadata(self, path, selected_metadata, is_dir=False):
-        stat = os.stat(path)
+    def run_network_scan(self):
+        scanner = NetworkScanner(self.directory, self.limit_depth_enabled, self.max_depth,
+                                 should_continue=lambda: self.is_running)
+
+        # First pass counts items with many directory listings in flight
+        total_items = scanner.count_items()
+        self.preparation_finished.emit(total_items)
+
+        if total_items == 0:
+            self.finished.emit([])
+            return
+
+        # Second pass lists and stats every item concurrently. Sorted output takes
+        # rows in any order; scan order is kept by holding early arrivals only until
+        # the items before them have finished, then flushing that contiguous prefix
+        file_data = self.create_file_data()
+        waiting_rows = {}
+        next_index = 0
+        processed_items = 0
+
+        def on_result(index, path, is_dir, stat, error):
+            nonlocal next_index, processed_items
+            metadata = None
+            if isinstance(error, FileNotFoundError):
+                print(f"Skipping missing path or broken link: {path}")
+            elif error is not None:
+                print(f"Error processing '{path}': {error}")
+            else:
+                try:
+                    metadata = self.get_file_metadata(path, self.metadata_cols, is_dir, stat)
+                except Exception as e:
+                    print(f"Error processing '{path}': {e}")
+
+            if self.sort_by:
+                if metadata is not None:
+                    self.add_row(file_data, path, stat, is_dir, metadata)
+            else:
+                waiting_rows[index] = metadata  # None marks an item that was skipped
+                while next_index in waiting_rows:
+                    row = waiting_rows.pop(next_index)
+                    if row is not None:
+                        file_data.append(row)
+                    next_index += 1
+
+            processed_items += 1
+            self.progress_updated.emit(processed_items)
+
+        scanner.scan(on_result)
+        self.network_report = scanner.report()
+        print(scanner.format_report())
+
+        if self.is_running:
+            self.finished.emit(file_data)
+        elif self.sort_by:
+            file_data.close()
+
+    def get_depth(self, root):
+        """Depth of an os.walk root below the scanned directory, which is depth 0.
+
+        Worked out from the relative path so a trailing separator (e.g. a drive
+        root like C:\\) doesn't shift every depth by one.
+        """
+        relative_path = os.path.relpath(root, self.directory)
+        return 0 if relative_path == os.curdir else relative_path.count(os.sep) + 1
+
+    def create_file_data(self):
+        if self.sort_by:
+            return ExternalSorter(self.sort_descending, self.sort_memory_limit_mb)
+        return []
+
+    def add_row(self, file_data, path, stat, is_dir, metadata):
+        if self.sort_by:
+            file_data.add(make_sort_key(self.sort_by, path, stat, is_dir), metadata)
+        else:
+            file_data.append(metadata)
+
+    def get_file_metadata(self, path, selected_metadata, is_dir=False, stat=None):
+        if stat is None:
+            stat = os.stat(path)
         metadata = {}
 
         if "File Name" in selected_metadata: metadata["File Name"] = os.path.basename(path)